@@ -1,13 +1,19 @@
 import re
+import os
 import csv
 import sys
 import time
+import socket
+import hashlib
+import threading
 import logging
 import argparse
 import requests
 from bs4 import BeautifulSoup
 from furl import furl
+from collections import deque
 from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -17,6 +23,31 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from requests.exceptions import RequestException
 from contact_identifiers import CONTACT_PATTERN
+from page_archive import PageArchive, ArchiveReplay
+from page_cache import PageCache
+from verification_ledger import VerificationLedger
+from sitemap_discovery import discover_contact_pages
+
+EMAIL_DOMAIN_PATTERN = re.compile(r'@([\w.-]+)')
+ROW_INDEX_FIELD = 'input_row'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+LATENCY_WINDOW = 200
+HOST_LATENCY_WINDOW = 20
+MIN_LATENCY_SAMPLES = 20
+MIN_CONNECT_TIMEOUT = 2
+CONNECT_TIMEOUT_FACTOR = 3
+READ_TIMEOUT_FACTOR = 2
+HEDGED_REQUESTS = 2
+RESULT_FIELDS = ['resolved_domain', 'resolved_url', 'resolution_method', 'was_redirected',
+                 'status_code', 'email_found', 'contact_page_checked', 'evidence_url']
+SECOND_LEVEL_LABELS = {'ac', 'co', 'com', 'edu', 'gov', 'net', 'org', 'gob', 'go', 'or', 'ne', 'sch', 'nic', 'res'}
+
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif",
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.avi", "*.mov", "*.pdf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*matomo*", "*piwik*"]
 
 
 def setup_logging():
@@ -47,21 +78,82 @@ def parse_arguments():
                         default=5, help="Max redirects")
     parser.add_argument("-v", "--verify", type=bool,
                         default=True, help="Verify SSL")
+    parser.add_argument("--fixed-timeouts", action="store_true",
+                        help="Use --timeout for every request instead of latency-based timeouts")
+    parser.add_argument("--no-hedge", dest="hedge", action="store_false",
+                        help="Try URL variations one at a time instead of hedging slow requests")
+    parser.add_argument("-p", "--render-profile", choices=["full", "light"],
+                        default="full", help="Browser render profile")
+    parser.add_argument("-b", "--max-page-bytes", type=int,
+                        default=2_000_000, help="Max HTML bytes kept per page in the light profile")
+    parser.add_argument("-a", "--archive", default=None,
+                        help="Append fetched pages to this compressed WARC file")
+    parser.add_argument("--replay", default=None,
+                        help="Re-run checks against a WARC archive without network or browser")
+    parser.add_argument("--shard", type=parse_shard, default=None,
+                        help="Process only shard i of N (0-based), e.g. 0/4")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip rows already present in the output file")
+    parser.add_argument("--merge", nargs="+", default=None, metavar="SHARD_CSV",
+                        help="Merge shard outputs into the output file in input order")
+    parser.add_argument("-m", "--discover-sitemaps", action="store_true",
+                        help="Find contact pages via robots.txt and sitemaps before rendering the homepage")
+    parser.add_argument("-l", "--ledger", default=None,
+                        help="SQLite verification ledger recording each (id, domain) outcome")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse confirmed ledger outcomes younger than --ledger-ttl")
+    parser.add_argument("--ledger-ttl", type=float, default=90,
+                        help="Days before a confirmed ledger outcome is re-checked")
+    parser.add_argument("-c", "--cache", default=None,
+                        help="SQLite page cache file shared across rows and runs")
+    parser.add_argument("--cache-ttl", type=float, default=7,
+                        help="Days before a cached page is re-rendered")
+    parser.add_argument("--cache-max-mb", type=int, default=2048,
+                        help="Max compressed HTML kept in the page cache, in MB")
     return parser.parse_args()
 
 
-def setup_webdriver():
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must be i/N, got {value}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Shard index must be in 0..N-1, got {value}")
+    return index, count
+
+
+def setup_webdriver(render_profile="full"):
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     prefs = {"profile.default_content_setting_values.geolocation": 2,
              "intl.accept_languages": ""}
+    if render_profile == "light":
+        prefs.update({"profile.managed_default_content_settings.images": 2,
+                      "profile.managed_default_content_settings.fonts": 2,
+                      "profile.managed_default_content_settings.media_stream": 2,
+                      "profile.managed_default_content_settings.plugins": 2})
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--mute-audio")
     chrome_options.add_experimental_option("prefs", prefs)
     chrome_options.add_argument(
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko)")
     service = Service('/opt/homebrew/bin/chromedriver')
-    return webdriver.Chrome(service=service, options=chrome_options)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if render_profile == "light":
+        configure_light_profile(driver)
+    return driver
+
+
+def configure_light_profile(driver):
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {"headers": {}})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": BLOCKED_URL_PATTERNS})
 
 
 def normalize_domain(domain):
@@ -86,6 +178,23 @@ def clean_url(url):
         return url.rstrip('/')
 
 
+def registrable_host(url):
+    try:
+        host = furl(url if '://' in url else f'http://{url}').host or ''
+    except ValueError:
+        host = ''
+    labels = [label for label in host.lower().rstrip('.').split('.') if label]
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def shard_for_row(row, args, shard_count):
+    host = registrable_host(row.get(args.website, '').strip())
+    digest = hashlib.sha1(host.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count
+
+
 def is_url_different(url1, url2):
     norm_url1 = clean_url(url1).rstrip('/').lower()
     norm_url2 = clean_url(url2).rstrip('/').lower()
@@ -96,27 +205,160 @@ def construct_url_variations(domain, url):
     return [f"https://www.{domain}", f"https://{domain}", url, f"http://{domain}", f"http://www.{domain}"]
 
 
-def resolve_domain(domain, url, timeout=10, max_redirects=5, verify_ssl=True):
-    session = requests.Session()
-    urls_to_try = construct_url_variations(domain, url)
-    for url in urls_to_try:
-        try:
-            response = session.get(url, timeout=timeout, allow_redirects=True, verify=verify_ssl,
-                                   headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
-            if response.status_code == 200:
-                return {'success': True, 'url': clean_url(response.url), 'status_code': response.status_code,
-                        'was_redirected': len(response.history) > 0, 'original_url': url}
-        except RequestException as e:
+class LatencyTracker:
+    def __init__(self):
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+        self.host_samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, host, latency):
+        with self.lock:
+            self.samples.append(latency)
+            self.host_samples.setdefault(host, deque(maxlen=HOST_LATENCY_WINDOW)).append(latency)
+
+    def p95(self, samples):
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def timeouts(self, host, timeout):
+        with self.lock:
+            samples = list(self.samples)
+            host_samples = list(self.host_samples.get(host, ()))
+        connect_timeout = timeout
+        if len(samples) >= MIN_LATENCY_SAMPLES:
+            connect_timeout = min(timeout, max(MIN_CONNECT_TIMEOUT, CONNECT_TIMEOUT_FACTOR * self.p95(samples)))
+        read_timeout = timeout
+        if host_samples:
+            read_timeout = max(timeout, READ_TIMEOUT_FACTOR * self.p95(host_samples))
+        return connect_timeout, read_timeout
+
+    def hedge_delay(self, host, timeout):
+        with self.lock:
+            samples = list(self.samples)
+            host_samples = list(self.host_samples.get(host, ()))
+        if host_samples:
+            return self.p95(host_samples)
+        if len(samples) >= MIN_LATENCY_SAMPLES:
+            return self.p95(samples)
+        return timeout / 2
+
+
+latency_tracker = LatencyTracker()
+
+
+def url_host(url):
+    return normalize_domain(urlparse(url).hostname or '')
+
+
+class AbortableSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        self.connections = []
+        self.aborted = False
+        for adapter in self.adapters.values():
+            adapter.poolmanager.pool_classes_by_scheme = {
+                scheme: self.tracked_pool(pool_cls)
+                for scheme, pool_cls in adapter.poolmanager.pool_classes_by_scheme.items()}
+
+    def tracked_pool(self, pool_cls):
+        connections = self.connections
+
+        class TrackedPool(pool_cls):
+            def _new_conn(self):
+                conn = super()._new_conn()
+                connections.append(conn)
+                return conn
+        return TrackedPool
+
+    def abort(self):
+        self.aborted = True
+        for conn in list(self.connections):
+            sock = conn.sock
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self.close()
+
+
+def request_variation(url, timeouts, max_redirects, verify_ssl, latency=None, session=None):
+    session = session or AbortableSession()
+    session.max_redirects = max_redirects
+    try:
+        response = session.get(url, timeout=timeouts, allow_redirects=True, verify=verify_ssl,
+                               stream=True, headers={'User-Agent': USER_AGENT})
+        response.close()
+        if response.status_code == 200:
+            if latency:
+                latency.record(url_host(url), response.elapsed.total_seconds())
+            return {'success': True, 'url': clean_url(response.url), 'status_code': response.status_code,
+                    'was_redirected': len(response.history) > 0, 'original_url': url}
+    except RequestException as e:
+        if not session.aborted:
             logger.warning(f"Failed to resolve {url}: {e}")
-            continue
+    finally:
+        session.close()
+    return None
+
+
+def resolve_domain(domain, url, timeout=10, max_redirects=5, verify_ssl=True, latency=None, hedge=False):
+    urls_to_try = construct_url_variations(domain, url)
+    host = normalize_domain(domain)
+    timeouts = latency.timeouts(host, timeout) if latency else timeout
+    if not hedge:
+        for url in urls_to_try:
+            result = request_variation(url, timeouts, max_redirects, verify_ssl, latency)
+            if result:
+                return result
+        return {'success': False, 'url': None, 'status_code': None, 'was_redirected': False, 'original_url': None}
+    hedge_delay = latency.hedge_delay(host, timeout) if latency else timeout / 2
+    executor = ThreadPoolExecutor(max_workers=HEDGED_REQUESTS)
+    sessions = {}
+    pending = set()
+    next_index = 0
+    replace_failed = False
+
+    def submit(url):
+        session = AbortableSession()
+        future = executor.submit(request_variation, url, timeouts, max_redirects, verify_ssl, latency, session)
+        sessions[future] = session
+        pending.add(future)
+
+    try:
+        while next_index < len(urls_to_try) or pending:
+            can_hedge = next_index < len(urls_to_try) and len(pending) < HEDGED_REQUESTS
+            if can_hedge and (replace_failed or not pending):
+                submit(urls_to_try[next_index])
+                next_index += 1
+                replace_failed = False
+                continue
+            done, pending = wait(pending, timeout=hedge_delay if can_hedge else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result():
+                    return future.result()
+            replace_failed = bool(done)
+            if not done and can_hedge:
+                logger.info(f"Hedging {urls_to_try[next_index]} after {hedge_delay:.1f}s")
+                submit(urls_to_try[next_index])
+                next_index += 1
+    finally:
+        for future in pending:
+            sessions[future].abort()
+        executor.shutdown(wait=False, cancel_futures=True)
     return {'success': False, 'url': None, 'status_code': None, 'was_redirected': False, 'original_url': None}
 
 
-def check_email_domain(html_content, domain):
+def extract_email_domains(html_content):
     if html_content is None:
-        return False
-    pattern = r'@' + re.escape(normalize_domain(domain))
-    return bool(re.search(pattern, html_content))
+        return []
+    return sorted(set(EMAIL_DOMAIN_PATTERN.findall(html_content)))
+
+
+def check_email_domain(email_domains, domain):
+    domain = normalize_domain(domain)
+    return any(email_domain.startswith(domain) for email_domain in email_domains)
 
 
 def identify_contact_pages(links):
@@ -136,9 +378,29 @@ def extract_links(html_content, base_url):
     return links
 
 
-def fetch_html_content(driver, url, timeout=10):
+def fetch_html_content(driver, url, timeout=10, render_profile="full", max_page_bytes=None):
     try:
         driver.delete_all_cookies()
+        if render_profile == "light":
+            driver.set_page_load_timeout(timeout)
+            driver.get('about:blank')
+            timed_out = False
+            try:
+                driver.get(url)
+            except TimeoutException:
+                timed_out = True
+            driver.execute_script("window.stop();")
+            if timed_out:
+                if driver.current_url == 'about:blank':
+                    logger.warning(f"Failed to access URL {url}: page load timed out before any content arrived")
+                    return {'success': False, 'content': None, 'final_url': None}
+                logger.info(f"Page load timed out for {url}, using the partially loaded page")
+            content = driver.page_source
+            if max_page_bytes:
+                encoded = content.encode('utf-8')
+                if len(encoded) > max_page_bytes:
+                    content = encoded[:max_page_bytes].decode('utf-8', errors='ignore')
+            return {'success': True, 'content': content, 'final_url': driver.current_url}
         driver.execute_cdp_cmd('Network.enable', {})
         driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {"headers": {}})
         driver.get(url)
@@ -153,7 +415,69 @@ def fetch_html_content(driver, url, timeout=10):
         return {'success': False, 'content': None, 'final_url': None}
 
 
-def process_row(driver, row, args):
+def resolve_site(domain, website, args, archive=None, replay=None):
+    if replay:
+        return replay.get_resolution(domain, website)
+    resolution_result = resolve_domain(domain, website, timeout=args.timeout,
+                                       max_redirects=args.redirects, verify_ssl=args.verify,
+                                       latency=None if args.fixed_timeouts else latency_tracker,
+                                       hedge=args.hedge)
+    if archive:
+        archive.record_resolution(domain, website, resolution_result)
+    return resolution_result
+
+
+def scan_page(html_result):
+    if html_result['success']:
+        html_result['links'] = extract_links(html_result['content'], html_result['final_url'])
+        html_result['email_domains'] = extract_email_domains(html_result['content'])
+    return html_result
+
+
+def fetch_page(driver, url, args, archive=None, replay=None, page_cache=None, status_code=None):
+    if replay:
+        return scan_page(replay.get_page(url))
+    if page_cache:
+        cached_page = page_cache.get(url, with_content=archive is not None)
+        if cached_page:
+            logger.info(f"Using cached page for {url}")
+            if archive:
+                archive.record_page(url, cached_page, status_code)
+                cached_page['content'] = None
+            return cached_page
+    html_result = fetch_html_content(driver, url, timeout=args.timeout,
+                                     render_profile=args.render_profile,
+                                     max_page_bytes=args.max_page_bytes)
+    if archive and html_result['success']:
+        archive.record_page(url, html_result, status_code)
+    scan_page(html_result)
+    if page_cache and html_result['success']:
+        page_cache.put(url, html_result)
+    return html_result
+
+
+def discover_site_contact_pages(url, args, archive=None, replay=None):
+    if replay:
+        return replay.get_discovery(url)
+    contact_pages = discover_contact_pages(url, timeout=args.timeout, verify_ssl=args.verify)
+    if archive:
+        archive.record_discovery(url, contact_pages)
+    return contact_pages
+
+
+def check_contact_pages(driver, contact_pages, domain, result, args, archive=None, replay=None,
+                        page_cache=None):
+    for contact_page in contact_pages:
+        contact_result = fetch_page(driver, contact_page, args, archive, replay, page_cache)
+        if contact_result['success'] and check_email_domain(contact_result['email_domains'], domain):
+            result['email_found'] = True
+            result['evidence_url'] = contact_result['final_url'] or contact_page
+            logger.info(f"Email domain found on contact page for {result.get(args.id, 'unknown')}")
+            return True
+    return False
+
+
+def process_row(driver, row, args, archive=None, replay=None, page_cache=None, ledger=None):
     logger.info(f"Processing: {row.get(args.id, 'unknown')}")
     website = row.get(args.website, "").strip()
     if not website:
@@ -166,36 +490,47 @@ def process_row(driver, row, args):
     for domain in domains:
         if not domain:
             continue
-        resolution_result = resolve_domain(domain, website, timeout=args.timeout,
-                                           max_redirects=args.redirects, verify_ssl=args.verify)
+        ror_id = row.get(args.id, 'unknown')
+        if ledger and args.incremental:
+            verified = ledger.lookup(ror_id, domain, args.ledger_ttl * 86400)
+            if verified:
+                logger.info(f"Reusing ledger verification for {ror_id} {domain}")
+                return {**row, **verified}
+        resolution_result = resolve_site(domain, website, args, archive, replay)
         result = {**row}
         result.update({'resolved_domain': domain, 'resolved_url': resolution_result['url'],
                        'resolution_method': resolution_result['original_url'],
                        'was_redirected': resolution_result['was_redirected'],
                        'status_code': resolution_result['status_code'],
-                       'email_found': False, 'contact_page_checked': False})
+                       'email_found': False, 'contact_page_checked': False, 'evidence_url': None})
         if resolution_result['success']:
-            html_result = fetch_html_content(driver, resolution_result['url'])
-            if html_result['success']:
-                content = html_result['content']
-                final_url = html_result['final_url']
-                if check_email_domain(content, domain):
-                    result['email_found'] = True
-                    logger.info(f"Email domain found on main page for {row.get(args.id, 'unknown')}")
-                else:
-                    logger.info(f"Checking contact pages for {row.get(args.id, 'unknown')}")
-                    links = extract_links(content, final_url)
-                    contact_pages = identify_contact_pages(links)
-                    result['contact_page_checked'] = bool(contact_pages)
-                    for contact_page in contact_pages:
-                        contact_result = fetch_html_content(
-                            driver, contact_page)
-                        if contact_result['success'] and check_email_domain(contact_result['content'], domain):
-                            result['email_found'] = True
-                            logger.info(f"Email domain found on contact page for {row.get(args.id, 'unknown')}")
-                            break
-                    if not result['email_found']:
-                        logger.info(f"Email domain not found for {row.get(args.id, 'unknown')}")
+            discovered_pages = []
+            if args.discover_sitemaps:
+                discovered_pages = discover_site_contact_pages(resolution_result['url'], args, archive, replay)
+                if discovered_pages:
+                    logger.info(f"Checking {len(discovered_pages)} sitemap contact pages for {ror_id}")
+                    result['contact_page_checked'] = True
+                    check_contact_pages(driver, discovered_pages, domain, result, args,
+                                        archive, replay, page_cache)
+            if not result['email_found']:
+                html_result = fetch_page(driver, resolution_result['url'], args, archive, replay, page_cache,
+                                         status_code=resolution_result['status_code'])
+                if html_result['success']:
+                    if check_email_domain(html_result['email_domains'], domain):
+                        result['email_found'] = True
+                        result['evidence_url'] = html_result['final_url']
+                        logger.info(f"Email domain found on main page for {ror_id}")
+                    else:
+                        logger.info(f"Checking contact pages for {ror_id}")
+                        contact_pages = [page for page in identify_contact_pages(html_result['links'])
+                                         if page not in discovered_pages]
+                        result['contact_page_checked'] = result['contact_page_checked'] or bool(contact_pages)
+                        check_contact_pages(driver, contact_pages, domain, result, args,
+                                            archive, replay, page_cache)
+            if not result['email_found']:
+                logger.info(f"Email domain not found for {ror_id}")
+        if ledger:
+            ledger.record(ror_id, domain, {field: result[field] for field in RESULT_FIELDS})
         return result
 
 
@@ -203,7 +538,7 @@ def create_error_result(row):
     result = {**row}
     result.update({'resolved_domain': None, 'resolved_url': None, 'resolution_method': None,
                    'was_redirected': False, 'status_code': None, 'email_found': False,
-                   'contact_page_checked': False})
+                   'contact_page_checked': False, 'evidence_url': None})
     return result
 
 
@@ -226,7 +561,18 @@ def append_to_csv(file_path, row, fieldnames):
         logger.error(f"Error appending to CSV file: {e}")
 
 
-def process_input_file(args, driver):
+def read_completed_rows(file_path):
+    if not os.path.exists(file_path):
+        return set()
+    with open(file_path, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if not reader.fieldnames or ROW_INDEX_FIELD not in reader.fieldnames:
+            logger.error(f"Cannot resume: {file_path} has no {ROW_INDEX_FIELD} column")
+            sys.exit(1)
+        return {int(row[ROW_INDEX_FIELD]) for row in reader if row[ROW_INDEX_FIELD]}
+
+
+def process_input_file(args, driver, archive=None, replay=None, page_cache=None, ledger=None):
     try:
         with open(args.input, 'r', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
@@ -240,15 +586,28 @@ def process_input_file(args, driver):
             if not input_fieldnames:
                 logger.error("Input file has no headers")
                 return
-            output_fieldnames = input_fieldnames + \
-                ['resolved_domain', 'resolved_url', 'resolution_method',
-                    'was_redirected', 'status_code', 'email_found', 'contact_page_checked']
-            write_csv_header(args.output, output_fieldnames)
-            for row in reader:
+            output_fieldnames = input_fieldnames + RESULT_FIELDS
+            track_rows = bool(args.shard or args.resume)
+            if track_rows:
+                output_fieldnames = output_fieldnames + [ROW_INDEX_FIELD]
+            completed_rows = read_completed_rows(args.output) if args.resume else set()
+            if completed_rows:
+                logger.info(f"Resuming: {len(completed_rows)} rows already in {args.output}")
+            else:
+                write_csv_header(args.output, output_fieldnames)
+            for row_index, row in enumerate(reader):
+                if args.shard and shard_for_row(row, args, args.shard[1]) != args.shard[0]:
+                    continue
+                if row_index in completed_rows:
+                    continue
+                if track_rows:
+                    row = {**row, ROW_INDEX_FIELD: row_index}
                 try:
-                    result = process_row(driver, row, args)
+                    reused = ledger.reused if ledger else 0
+                    result = process_row(driver, row, args, archive, replay, page_cache, ledger)
                     append_to_csv(args.output, result, output_fieldnames)
-                    time.sleep(1)
+                    if not replay and not (ledger and ledger.reused > reused):
+                        time.sleep(1)
                 except Exception as e:
                     logger.error(f"Error processing row {row.get(args.id, 'unknown')}: {e}")
                     error_result = create_error_result(row)
@@ -259,6 +618,43 @@ def process_input_file(args, driver):
         raise
 
 
+def merge_shards(args):
+    with open(args.input, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        input_fieldnames = reader.fieldnames
+        total_rows = sum(1 for _ in reader)
+    merged = {}
+    duplicated = set()
+    output_fieldnames = None
+    for shard_file in args.merge:
+        with open(shard_file, 'r', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            if not reader.fieldnames or ROW_INDEX_FIELD not in reader.fieldnames:
+                logger.error(f"Shard output {shard_file} has no {ROW_INDEX_FIELD} column")
+                sys.exit(1)
+            output_fieldnames = output_fieldnames or [
+                field for field in reader.fieldnames if field != ROW_INDEX_FIELD]
+            for row in reader:
+                row_index = int(row.pop(ROW_INDEX_FIELD))
+                if row_index in merged:
+                    duplicated.add(row_index)
+                    continue
+                merged[row_index] = row
+    missing = [row_index for row_index in range(total_rows) if row_index not in merged]
+    with open(args.output, 'w', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=output_fieldnames or input_fieldnames)
+        writer.writeheader()
+        for row_index in sorted(merged):
+            writer.writerow(merged[row_index])
+    logger.info(f"Merged {len(merged)} of {total_rows} rows from {len(args.merge)} shards into {args.output}")
+    if missing:
+        logger.warning(f"{len(missing)} rows missing from shard outputs, e.g. input rows {missing[:20]}")
+    if duplicated:
+        logger.warning(f"{len(duplicated)} rows duplicated across shard outputs, e.g. input rows "
+                       f"{sorted(duplicated)[:20]}")
+    return missing, duplicated
+
+
 def cleanup(driver):
     try:
         driver.quit()
@@ -269,11 +665,31 @@ def cleanup(driver):
 
 def main():
     args = parse_arguments()
+    if args.merge:
+        merge_shards(args)
+        return
     logger.info("Starting domain resolution and checking process")
     driver = None
+    archive = None
+    replay = None
+    page_cache = None
+    ledger = None
     try:
-        driver = setup_webdriver()
-        process_input_file(args, driver)
+        if args.ledger and args.replay:
+            logger.warning("Ignoring --ledger in replay mode, archived pages are not fresh checks")
+        elif args.ledger:
+            ledger = VerificationLedger(args.ledger)
+        if args.replay:
+            replay = ArchiveReplay(args.replay)
+            logger.info(f"Replaying {len(replay.page_offsets)} archived pages from {args.replay}")
+        else:
+            if args.archive:
+                archive = PageArchive(args.archive)
+            if args.cache:
+                page_cache = PageCache(args.cache, clean_url, ttl=args.cache_ttl * 86400,
+                                       max_bytes=args.cache_max_mb * 1024 ** 2)
+            driver = setup_webdriver(args.render_profile)
+        process_input_file(args, driver, archive, replay, page_cache, ledger)
         logger.info("Processing completed successfully")
     except Exception as e:
         logger.error(f"Fatal error during execution: {e}")
@@ -281,6 +697,16 @@ def main():
     finally:
         if driver:
             cleanup(driver)
+        if archive:
+            archive.close()
+        if replay:
+            replay.close()
+        if page_cache:
+            logger.info(f"Page cache hits: {page_cache.hits}, misses: {page_cache.misses}")
+            page_cache.close()
+        if ledger:
+            logger.info(f"Reused {ledger.reused} verifications from the ledger")
+            ledger.close()
 
 
 if __name__ == "__main__":
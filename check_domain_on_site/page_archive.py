@@ -0,0 +1,110 @@
+import json
+import threading
+from io import BytesIO
+from warcio.warcwriter import WARCWriter
+from warcio.archiveiterator import ArchiveIterator
+from warcio.statusandheaders import StatusAndHeaders
+
+RESOLUTION_HEADER = 'X-Resolved-Domain'
+REQUESTED_URI_HEADER = 'X-Requested-URI'
+DISCOVERY_HEADER = 'X-Sitemap-Contact-Pages'
+STATUS_REASONS = {200: 'OK', 301: 'Moved Permanently', 302: 'Found', 304: 'Not Modified',
+                  404: 'Not Found', 500: 'Internal Server Error'}
+
+
+class PageArchive:
+    def __init__(self, file_path):
+        self.file = open(file_path, 'ab')
+        self.writer = WARCWriter(self.file, gzip=True)
+        self.lock = threading.Lock()
+
+    def record_resolution(self, domain, website, resolution):
+        payload = json.dumps(resolution).encode('utf-8')
+        record = self.writer.create_warc_record(
+            website, 'metadata', payload=BytesIO(payload),
+            warc_content_type='application/json',
+            warc_headers_dict={RESOLUTION_HEADER: domain})
+        self.write(record)
+
+    def record_discovery(self, url, contact_pages):
+        payload = json.dumps(contact_pages).encode('utf-8')
+        record = self.writer.create_warc_record(
+            url, 'metadata', payload=BytesIO(payload),
+            warc_content_type='application/json',
+            warc_headers_dict={DISCOVERY_HEADER: str(len(contact_pages))})
+        self.write(record)
+
+    def record_page(self, url, page, status_code=None):
+        payload = page['content'].encode('utf-8')
+        target_uri = page['final_url'] or url
+        if status_code is None:
+            record = self.writer.create_warc_record(
+                target_uri, 'resource', payload=BytesIO(payload),
+                warc_content_type='text/html; charset=utf-8',
+                warc_headers_dict={REQUESTED_URI_HEADER: url})
+        else:
+            http_headers = StatusAndHeaders(
+                f"{status_code} {STATUS_REASONS.get(status_code, 'Unknown')}",
+                [('Content-Type', 'text/html; charset=utf-8'), ('Content-Length', str(len(payload)))],
+                protocol='HTTP/1.1')
+            record = self.writer.create_warc_record(
+                target_uri, 'response', payload=BytesIO(payload),
+                http_headers=http_headers, warc_headers_dict={REQUESTED_URI_HEADER: url})
+        self.write(record)
+
+    def write(self, record):
+        with self.lock:
+            self.writer.write_record(record)
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ArchiveReplay:
+    def __init__(self, file_path):
+        self.file = open(file_path, 'rb')
+        self.resolutions = {}
+        self.discoveries = {}
+        self.page_offsets = {}
+        self.lock = threading.Lock()
+        self.build_index()
+
+    def build_index(self):
+        iterator = ArchiveIterator(self.file)
+        for record in iterator:
+            target_uri = record.rec_headers.get_header('WARC-Target-URI')
+            if record.rec_type == 'metadata' and record.rec_headers.get_header(RESOLUTION_HEADER) is not None:
+                domain = record.rec_headers.get_header(RESOLUTION_HEADER)
+                self.resolutions[(domain, target_uri)] = json.loads(record.content_stream().read())
+            elif record.rec_type == 'metadata' and record.rec_headers.get_header(DISCOVERY_HEADER) is not None:
+                self.discoveries[target_uri] = json.loads(record.content_stream().read())
+            elif record.rec_type in ('response', 'resource'):
+                offset = iterator.get_record_offset()
+                requested_uri = record.rec_headers.get_header(REQUESTED_URI_HEADER)
+                self.page_offsets[requested_uri or target_uri] = offset
+                self.page_offsets.setdefault(target_uri, offset)
+
+    def get_resolution(self, domain, website):
+        return self.resolutions.get((domain, website), {
+            'success': False, 'url': None, 'status_code': None,
+            'was_redirected': False, 'original_url': None})
+
+    def get_discovery(self, url):
+        return self.discoveries.get(url, [])
+
+    def get_page(self, url):
+        offset = self.page_offsets.get(url)
+        if offset is None:
+            return {'success': False, 'content': None, 'final_url': None, 'status_code': None}
+        with self.lock:
+            self.file.seek(offset)
+            record = next(iter(ArchiveIterator(self.file)))
+            content = record.content_stream().read().decode('utf-8', errors='replace')
+            status_code = int(record.http_headers.get_statuscode()) if record.rec_type == 'response' else None
+            return {'success': True, 'content': content,
+                    'final_url': record.rec_headers.get_header('WARC-Target-URI'),
+                    'status_code': status_code}
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,95 @@
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+EVICT_EVERY = 500
+
+
+class PageCache:
+    def __init__(self, file_path, normalize_url, ttl=7 * 86400, max_bytes=2 * 1024 ** 3):
+        self.normalize_url = normalize_url
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(file_path, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS pages (
+                content_hash TEXT PRIMARY KEY,
+                final_url TEXT,
+                html BLOB,
+                links TEXT,
+                email_domains TEXT,
+                size INTEGER,
+                fetched_at REAL,
+                accessed_at REAL);
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+        ''')
+        self.evict()
+
+    def get(self, url, with_content=False):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT p.content_hash, p.final_url, p.links, p.email_domains, p.fetched_at, '
+                f"{'p.html' if with_content else 'NULL'} "
+                'FROM urls u JOIN pages p ON u.content_hash = p.content_hash WHERE u.url = ?',
+                (url,)).fetchone()
+            if row is None or time.time() - row[4] > self.ttl:
+                self.misses += 1
+                return None
+            self.conn.execute('UPDATE pages SET accessed_at = ? WHERE content_hash = ?',
+                              (time.time(), row[0]))
+            self.conn.commit()
+            self.hits += 1
+        content = zlib.decompress(row[5]).decode('utf-8') if row[5] is not None else None
+        return {'success': True, 'content': content, 'final_url': row[1],
+                'links': json.loads(row[2]), 'email_domains': json.loads(row[3])}
+
+    def put(self, url, page):
+        content = page['content'].encode('utf-8')
+        content_hash = hashlib.sha256(content).hexdigest()
+        html = zlib.compress(content)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (content_hash, page['final_url'], html, json.dumps(page['links']),
+                 json.dumps(page['email_domains']), len(html), now, now))
+            self.conn.execute('INSERT OR REPLACE INTO urls VALUES (?, ?)', (url, content_hash))
+            if page['final_url']:
+                self.conn.execute('INSERT OR IGNORE INTO urls VALUES (?, ?)',
+                                  (self.normalize_url(page['final_url']), content_hash))
+            self.conn.commit()
+            self.puts += 1
+            evict = self.puts % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+        return content_hash
+
+    def evict(self):
+        with self.lock:
+            self.conn.execute('DELETE FROM pages WHERE fetched_at < ?', (time.time() - self.ttl,))
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+            if total > self.max_bytes:
+                for content_hash, size in self.conn.execute(
+                        'SELECT content_hash, size FROM pages ORDER BY accessed_at').fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self.conn.execute('DELETE FROM pages WHERE content_hash = ?', (content_hash,))
+                    total -= size
+            self.conn.execute(
+                'DELETE FROM urls WHERE content_hash NOT IN (SELECT content_hash FROM pages)')
+            self.conn.commit()
+
+    def close(self):
+        self.evict()
+        with self.lock:
+            self.conn.close()
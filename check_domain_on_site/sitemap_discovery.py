@@ -0,0 +1,84 @@
+import io
+import gzip
+import logging
+import requests
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse
+from requests.exceptions import RequestException
+from contact_identifiers import CONTACT_PATTERN
+
+GZIP_MAGIC = b'\x1f\x8b'
+MAX_SITEMAPS = 10
+MAX_SITEMAP_URLS = 50000
+MAX_CONTACT_CANDIDATES = 5
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+logger = logging.getLogger(__name__)
+
+
+def sitemaps_from_robots(session, base_url, timeout=10, verify_ssl=True):
+    robots_url = urljoin(base_url, '/robots.txt')
+    sitemaps = []
+    try:
+        response = session.get(robots_url, timeout=timeout, verify=verify_ssl,
+                               headers={'User-Agent': USER_AGENT})
+        if response.status_code == 200:
+            for line in response.text.splitlines():
+                key, _, value = line.partition(':')
+                if key.strip().lower() == 'sitemap' and value.strip():
+                    sitemaps.append(urljoin(base_url, value.strip()))
+    except RequestException as e:
+        logger.warning(f"Failed to fetch {robots_url}: {e}")
+    return sitemaps or [urljoin(base_url, '/sitemap.xml')]
+
+
+def iter_sitemap_locs(session, sitemap_url, timeout=10, verify_ssl=True):
+    response = session.get(sitemap_url, timeout=timeout, verify=verify_ssl, stream=True,
+                           headers={'User-Agent': USER_AGENT})
+    try:
+        if response.status_code != 200:
+            return
+        response.raw.decode_content = True
+        response.raw.auto_close = False
+        source = io.BufferedReader(response.raw)
+        if source.peek(2)[:2] == GZIP_MAGIC:
+            source = gzip.GzipFile(fileobj=source)
+        is_index = None
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if event == 'start':
+                if is_index is None:
+                    is_index = tag == 'sitemapindex'
+                continue
+            if tag == 'loc' and elem.text:
+                yield is_index, elem.text.strip()
+            elif tag in ('url', 'sitemap'):
+                elem.clear()
+    finally:
+        response.close()
+
+
+def discover_contact_pages(base_url, timeout=10, verify_ssl=True):
+    with requests.Session() as session:
+        pending = sitemaps_from_robots(session, base_url, timeout, verify_ssl)
+        seen_sitemaps = set()
+        candidates = set()
+        urls_scanned = 0
+        while pending and len(seen_sitemaps) < MAX_SITEMAPS and urls_scanned < MAX_SITEMAP_URLS:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+            try:
+                for is_index, loc in iter_sitemap_locs(session, sitemap_url, timeout, verify_ssl):
+                    if is_index:
+                        pending.append(loc)
+                        continue
+                    urls_scanned += 1
+                    if CONTACT_PATTERN.search(loc):
+                        candidates.add(loc)
+                    if urls_scanned >= MAX_SITEMAP_URLS:
+                        break
+            except (RequestException, ET.ParseError, OSError, EOFError) as e:
+                logger.warning(f"Failed to read sitemap {sitemap_url}: {e}")
+    return sorted(candidates, key=lambda url: (len(urlparse(url).path), url))[:MAX_CONTACT_CANDIDATES]
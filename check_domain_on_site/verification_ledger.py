@@ -0,0 +1,45 @@
+import json
+import time
+import sqlite3
+import threading
+
+
+class VerificationLedger:
+    def __init__(self, file_path):
+        self.lock = threading.Lock()
+        self.reused = 0
+        self.conn = sqlite3.connect(file_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS verifications (
+                ror_id TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                email_found INTEGER NOT NULL,
+                evidence_url TEXT,
+                result TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (ror_id, domain))
+        ''')
+        self.conn.commit()
+
+    def lookup(self, ror_id, domain, ttl):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT result, checked_at FROM verifications '
+                'WHERE ror_id = ? AND domain = ? AND email_found = 1',
+                (ror_id, domain)).fetchone()
+        if row is None or time.time() - row[1] > ttl:
+            return None
+        self.reused += 1
+        return json.loads(row[0])
+
+    def record(self, ror_id, domain, result):
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO verifications VALUES (?, ?, ?, ?, ?, ?)',
+                (ror_id, domain, int(bool(result['email_found'])), result.get('evidence_url'),
+                 json.dumps(result), time.time()))
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -5,13 +5,19 @@ import csv
 import json
 import glob
 import time
+import bisect
 import string
 import logging
+import asyncio
 import argparse
 import itertools
 import urllib.parse
+import threading
 import multiprocessing
+import aiohttp
 import requests
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from unidecode import unidecode
 from rapidfuzz import fuzz
 from functools import partial
@@ -19,6 +25,17 @@ from functools import partial
 MAX_PARALLEL_REQUESTS = 5
 RATE_LIMIT_CALLS = 1000
 RATE_LIMIT_PERIOD = 300
+RECORD_CACHE_SIZE = 5000
+RECORD_BATCH_SIZE = 20
+ROR_API_URL = 'https://api.ror.org/v2/organizations'
+ASYNC_REQUEST_TIMEOUT = 30
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60]
+SECOND_LEVEL_LABELS = {'ac', 'co', 'com', 'edu', 'gov', 'net', 'org', 'gob', 'go', 'or', 'ne', 'sch', 'nic', 'res'}
+FILE_HEADER = ['id', 'entityid', 'roles', 'regauth', 'e_displayname', 'entity_cat',
+               'roledesc', 'r_displayname', 'r_description', 'role_service_name', 'eccs_status', 'clash',
+               'validator_status', 'coco_status', 'coco_id', 'sirtfi_status', 'code', 'scopes', 'first_seen']
+ROR_HEADER = ["matched_ror_id", "matched_name",
+              "match_type", "match_ratio"]
 
 
 def setup_logging(verbose):
@@ -36,6 +53,18 @@ def parse_arguments():
         '-o', '--output', default="matched_ror_edugain.csv", help="Output CSV file path")
     parser.add_argument('-v', '--verbose', action='store_true',
                         help="Enable verbose logging")
+    parser.add_argument('-m', '--metrics',
+                        help="Metrics report JSON file path. Default is {output_filename}_metrics.json")
+    parser.add_argument('-p', '--progress-interval', type=int, default=60,
+                        help="Seconds between progress log lines")
+    parser.add_argument('-d', '--data-dump',
+                        help="ROR data dump JSON used to build a local website domain index")
+    parser.add_argument('-e', '--engine', choices=['pool', 'async'], default='pool',
+                        help="Execution engine: process pool or asyncio event loop")
+    parser.add_argument('-c', '--concurrency', type=int, default=20,
+                        help="Rows in flight at once when using the async engine")
+    parser.add_argument('--score-workers', type=int, default=2,
+                        help="Threads used for fuzzy scoring when using the async engine")
     return parser.parse_args()
 
 
@@ -46,6 +75,147 @@ def init_shared_rate_limiter():
     return GlobalRateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, shared_calls, shared_lock)
 
 
+def new_histogram():
+    return [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+def histogram_labels():
+    return [f"<={bucket}s" for bucket in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+
+
+def new_endpoint_stats():
+    return {'requests': 0, 'errors': 0, 'rate_limited': 0, 'latency_total': 0.0,
+            'latency_max': 0.0, 'histogram': new_histogram()}
+
+
+def format_duration(seconds):
+    if seconds == float('inf'):
+        return 'unknown'
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours:02d}:{minutes:02d}:{seconds:02d}" if days else f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class Telemetry:
+    def __init__(self, progress_interval=60):
+        self.lock = threading.Lock()
+        self.progress_interval = progress_interval
+        self.start_time = time.time()
+        self.last_progress = self.start_time
+        self.reset()
+
+    def reset(self):
+        self.endpoints = {}
+        self.limiter_wait = 0.0
+        self.scoring_time = 0.0
+        self.rows = 0
+        self.row_time_total = 0.0
+        self.row_time_max = 0.0
+        self.row_histogram = new_histogram()
+
+    def record_request(self, endpoint, latency, status=None, error=False):
+        with self.lock:
+            stats = self.endpoints.setdefault(endpoint, new_endpoint_stats())
+            stats['requests'] += 1
+            stats['latency_total'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+            stats['histogram'][bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            if error or (status is not None and status >= 400):
+                stats['errors'] += 1
+            if status == 429:
+                stats['rate_limited'] += 1
+
+    def record_limiter_wait(self, seconds):
+        with self.lock:
+            self.limiter_wait += seconds
+
+    def record_scoring(self, seconds):
+        with self.lock:
+            self.scoring_time += seconds
+
+    def record_row(self, seconds):
+        with self.lock:
+            self.rows += 1
+            self.row_time_total += seconds
+            self.row_time_max = max(self.row_time_max, seconds)
+            self.row_histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def snapshot(self):
+        return {'endpoints': {name: {**stats, 'histogram': list(stats['histogram'])}
+                              for name, stats in self.endpoints.items()},
+                'limiter_wait': self.limiter_wait, 'scoring_time': self.scoring_time,
+                'rows': self.rows, 'row_time_total': self.row_time_total,
+                'row_time_max': self.row_time_max, 'row_histogram': list(self.row_histogram)}
+
+    def drain(self):
+        with self.lock:
+            snapshot = self.snapshot()
+            self.reset()
+        return snapshot
+
+    def merge(self, snapshot):
+        with self.lock:
+            for name, other in snapshot['endpoints'].items():
+                stats = self.endpoints.setdefault(name, new_endpoint_stats())
+                for key in ['requests', 'errors', 'rate_limited', 'latency_total']:
+                    stats[key] += other[key]
+                stats['latency_max'] = max(stats['latency_max'], other['latency_max'])
+                stats['histogram'] = [a + b for a, b in zip(stats['histogram'], other['histogram'])]
+            self.limiter_wait += snapshot['limiter_wait']
+            self.scoring_time += snapshot['scoring_time']
+            self.rows += snapshot['rows']
+            self.row_time_total += snapshot['row_time_total']
+            self.row_time_max = max(self.row_time_max, snapshot['row_time_max'])
+            self.row_histogram = [a + b for a, b in zip(self.row_histogram, snapshot['row_histogram'])]
+
+    def log_progress(self, rows_done, total_rows, force=False):
+        now = time.time()
+        if not force and now - self.last_progress < self.progress_interval:
+            return
+        self.last_progress = now
+        elapsed = now - self.start_time
+        rate = rows_done / elapsed if elapsed > 0 else 0
+        eta = (total_rows - rows_done) / rate if rate > 0 else float('inf')
+        with self.lock:
+            requests_made = sum(stats['requests'] for stats in self.endpoints.values())
+            errors = sum(stats['errors'] for stats in self.endpoints.values())
+            limiter_wait = self.limiter_wait
+        logging.info(f"Progress: {rows_done}/{total_rows} rows, {rate:.2f} rows/s, "
+                     f"{requests_made} requests, {errors} errors, {limiter_wait:.0f}s rate limiter wait, "
+                     f"ETA {format_duration(eta)}")
+
+    def report(self):
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            labels = histogram_labels()
+            endpoints = {}
+            for name, stats in self.endpoints.items():
+                endpoints[name] = {
+                    'requests': stats['requests'], 'errors': stats['errors'],
+                    'rate_limited': stats['rate_limited'],
+                    'mean_latency': stats['latency_total'] / stats['requests'] if stats['requests'] else 0,
+                    'max_latency': stats['latency_max'],
+                    'total_latency': stats['latency_total'],
+                    'latency_histogram': dict(zip(labels, stats['histogram']))}
+            return {'elapsed_seconds': elapsed, 'rows': self.rows,
+                    'rows_per_second': self.rows / elapsed if elapsed > 0 else 0,
+                    'endpoints': endpoints,
+                    'rate_limiter_wait_seconds': self.limiter_wait,
+                    'scoring_seconds': self.scoring_time,
+                    'row_time': {'mean': self.row_time_total / self.rows if self.rows else 0,
+                                 'max': self.row_time_max,
+                                 'histogram': dict(zip(labels, self.row_histogram))}}
+
+    def write_report(self, file_path):
+        with open(file_path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        logging.info(f"Metrics report written to {file_path}")
+
+
+telemetry = Telemetry()
+
+
 class GlobalRateLimiter:
     def __init__(self, max_calls, period, shared_calls, shared_lock):
         self.max_calls = max_calls
@@ -63,10 +233,200 @@ class GlobalRateLimiter:
             self.calls.append(now)
 
 
+class AsyncRateLimiter:
+    def __init__(self, max_calls, period, max_parallel):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self.lock = asyncio.Lock()
+        self.in_flight = asyncio.Semaphore(max_parallel)
+
+    async def wait(self):
+        async with self.lock:
+            now = time.time()
+            while self.calls and now - self.calls[0] >= self.period:
+                self.calls.popleft()
+            if len(self.calls) >= self.max_calls:
+                sleep_time = self.period - (now - self.calls[0])
+                await asyncio.sleep(max(sleep_time, 0))
+                self.calls.popleft()
+            self.calls.append(time.time())
+
+
+def endpoint_name(url, params):
+    if url != ROR_API_URL:
+        return 'record'
+    params = params or {}
+    if 'affiliation' in params:
+        return 'affiliation_search'
+    if 'query' in params:
+        return 'name_search'
+    if params.get('query.advanced', '').startswith('id:'):
+        return 'batch_record'
+    return 'url_search'
+
+
 def rate_limited_request(url, params=None, rate_limiter=None):
     if rate_limiter:
+        wait_start = time.time()
         rate_limiter.wait()
-    return requests.get(url, params=params)
+        telemetry.record_limiter_wait(time.time() - wait_start)
+    request_start = time.time()
+    try:
+        response = requests.get(url, params=params)
+    except requests.RequestException:
+        telemetry.record_request(endpoint_name(url, params), time.time() - request_start, error=True)
+        raise
+    telemetry.record_request(endpoint_name(url, params), time.time() - request_start,
+                             status=response.status_code)
+    return response
+
+
+async def async_rate_limited_request(session, url, params=None, rate_limiter=None):
+    if rate_limiter:
+        async with rate_limiter.in_flight:
+            return await async_request(session, url, params, rate_limiter)
+    return await async_request(session, url, params)
+
+
+async def async_request(session, url, params=None, rate_limiter=None):
+    if rate_limiter:
+        wait_start = time.time()
+        await rate_limiter.wait()
+        telemetry.record_limiter_wait(time.time() - wait_start)
+    request_start = time.time()
+    try:
+        response = await session.get(url, params=params)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        telemetry.record_request(endpoint_name(url, params), time.time() - request_start, error=True)
+        raise
+    async with response:
+        telemetry.record_request(endpoint_name(url, params), time.time() - request_start,
+                                 status=response.status)
+        response.raise_for_status()
+        return await response.json()
+
+
+class RecordCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.records = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, ror_id):
+        with self.lock:
+            record = self.records.get(ror_id)
+            if record is not None:
+                self.records.move_to_end(ror_id)
+            return record
+
+    def put(self, ror_id, record):
+        with self.lock:
+            self.records[ror_id] = record
+            self.records.move_to_end(ror_id)
+            while len(self.records) > self.max_size:
+                self.records.popitem(last=False)
+
+    def __contains__(self, ror_id):
+        with self.lock:
+            return ror_id in self.records
+
+
+record_cache = RecordCache(RECORD_CACHE_SIZE)
+domain_index = None
+
+
+def url_host(url):
+    url = url.strip()
+    if not url:
+        return None
+    try:
+        host = urllib.parse.urlsplit(url if '://' in url else f'//{url}').hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    host = host.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+def registrable_label_count(reversed_labels):
+    if len(reversed_labels) >= 2 and len(reversed_labels[0]) == 2 and reversed_labels[1] in SECOND_LEVEL_LABELS:
+        return 3
+    return 2
+
+
+class DomainSuffixIndex:
+    def __init__(self):
+        self.root = {}
+        self.names = {}
+
+    def add(self, url, ror_id, ror_name=None):
+        host = url_host(url)
+        if not host:
+            return
+        node = self.root
+        for label in reversed(host.split('.')):
+            if label:
+                node = node.setdefault(label, {})
+        node.setdefault(None, set()).add(ror_id)
+        if ror_name:
+            self.names[ror_id] = ror_name
+
+    def lookup(self, scope):
+        host = url_host(scope)
+        if not host:
+            return set()
+        labels = [label for label in reversed(host.split('.')) if label]
+        min_depth = registrable_label_count(labels)
+        matched = set()
+        node = self.root
+        for depth, label in enumerate(labels, 1):
+            node = node.get(label)
+            if node is None:
+                return matched
+            if depth >= min_depth:
+                matched.update(node.get(None, ()))
+        if len(labels) >= min_depth:
+            stack = [child for label, child in node.items() if label is not None]
+            while stack:
+                child = stack.pop()
+                matched.update(child.get(None, ()))
+                stack.extend(grandchild for label, grandchild in child.items() if label is not None)
+        return matched
+
+    def lookup_all(self, scopes):
+        matched = set()
+        for scope in scopes:
+            matched.update(self.lookup(scope))
+        return matched
+
+
+def build_domain_index(data_dump):
+    with open(data_dump, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    return index_ror_records(records)
+
+
+def index_ror_records(records):
+    index = DomainSuffixIndex()
+    for record in records:
+        ror_id = record.get('id')
+        if not ror_id:
+            continue
+        ror_name = next((name['value'] for name in record.get('names', [])
+                         if 'ror_display' in name.get('types', [])), None)
+        for website in extract_website_urls(record):
+            index.add(website, ror_id, ror_name)
+    logging.info(f"Indexed website domains for {len(index.names)} ROR records")
+    return index
+
+
+def set_domain_index(index):
+    global domain_index
+    domain_index = index
 
 
 def normalize(text):
@@ -94,16 +454,71 @@ class MatchInfo:
         return '; '.join(sorted(match_types))
 
 
-def ror_name_search(org_name, rate_limiter):
-    normalized_org_name = normalize(org_name)
+def name_search_params(normalized_org_name):
     query_params = {'query': f'"{normalized_org_name}"'}
     affiliation_params = {'affiliation': f'"{normalized_org_name}"'}
-    all_params = [query_params, affiliation_params]
+    return [query_params, affiliation_params]
+
+
+def score_name_results(normalized_org_name, items):
+    scoring_start = time.time()
+    ror_matches = {}
+    for result in items:
+        try:
+            org_data = result.get('organization', result)
+
+            ror_id = org_data.get('id')
+            if not ror_id:
+                logging.warning(f"No 'id' found in result: {org_data}")
+                continue
+            record_cache.put(ror_id, org_data)
+            ror_name = next((name['value'] for name in org_data.get('names', [])
+                             if 'ror_display' in name.get('types', [])), None)
+            if not ror_name:
+                logging.warning(f"No display name found for ROR ID: {ror_id}")
+                continue
+
+            match_info = MatchInfo()
+
+            aliases = set(name['value'] for name in org_data.get('names', [])
+                          if 'ror_display' not in name.get('types', []))
+            labels = set(name['value'] for name in org_data.get('names', [])
+                         if 'label' in name.get('types', []))
+
+            name_mr = fuzz.ratio(normalized_org_name, normalize(ror_name))
+            if name_mr >= 90:
+                match_info.add_name_match('name', name_mr)
+
+            for alias in aliases:
+                alias_mr = fuzz.ratio(
+                    normalized_org_name, normalize(alias))
+                if alias_mr >= 90:
+                    match_info.add_name_match('alias', alias_mr)
+
+            for label in labels:
+                label_mr = fuzz.ratio(
+                    normalized_org_name, normalize(label))
+                if label_mr >= 90:
+                    match_info.add_name_match('label', label_mr)
+
+            if match_info.name_matches:
+                ror_matches[ror_id] = (ror_name, match_info)
+
+        except Exception as e:
+            logging.error(f"Error processing result: {e}")
+            logging.error(f"Problematic result: {result}")
+
+    telemetry.record_scoring(time.time() - scoring_start)
+    return ror_matches
+
+
+def ror_name_search(org_name, rate_limiter):
+    normalized_org_name = normalize(org_name)
     ror_matches = {}
-    for params in all_params:
+    for params in name_search_params(normalized_org_name):
         try:
             response = rate_limited_request(
-                'https://api.ror.org/v2/organizations', params=params, rate_limiter=rate_limiter)
+                ROR_API_URL, params=params, rate_limiter=rate_limiter)
             response.raise_for_status()
             api_response = response.json()
         except requests.RequestException as e:
@@ -111,70 +526,43 @@ def ror_name_search(org_name, rate_limiter):
             continue
         if api_response['number_of_results'] == 0:
             continue
-        for result in api_response.get('items', []):
-            try:
-                org_data = result.get('organization', result)
-
-                ror_id = org_data.get('id')
-                if not ror_id:
-                    logging.warning(f"No 'id' found in result: {org_data}")
-                    continue
-                ror_name = next((name['value'] for name in org_data.get('names', [])
-                                 if 'ror_display' in name.get('types', [])), None)
-                if not ror_name:
-                    logging.warning(f"No display name found for ROR ID: {ror_id}")
-                    continue
-
-                match_info = MatchInfo()
-
-                aliases = set(name['value'] for name in org_data.get('names', [])
-                              if 'ror_display' not in name.get('types', []))
-                labels = set(name['value'] for name in org_data.get('names', [])
-                             if 'label' in name.get('types', []))
-
-                name_mr = fuzz.ratio(normalized_org_name, normalize(ror_name))
-                if name_mr >= 90:
-                    match_info.add_name_match('name', name_mr)
-
-                for alias in aliases:
-                    alias_mr = fuzz.ratio(
-                        normalized_org_name, normalize(alias))
-                    if alias_mr >= 90:
-                        match_info.add_name_match('alias', alias_mr)
-
-                for label in labels:
-                    label_mr = fuzz.ratio(
-                        normalized_org_name, normalize(label))
-                    if label_mr >= 90:
-                        match_info.add_name_match('label', label_mr)
-
-                if match_info.name_matches:
-                    ror_matches[ror_id] = (ror_name, match_info)
+        ror_matches.update(score_name_results(
+            normalized_org_name, api_response.get('items', [])))
+    return ror_matches
 
-            except Exception as e:
-                logging.error(f"Error processing result: {e}")
-                logging.error(f"Problematic result: {result}")
 
+async def async_ror_name_search(org_name, session, rate_limiter, executor):
+    normalized_org_name = normalize(org_name)
+    loop = asyncio.get_running_loop()
+    responses = await asyncio.gather(
+        *[async_rate_limited_request(session, ROR_API_URL, params=params, rate_limiter=rate_limiter)
+          for params in name_search_params(normalized_org_name)],
+        return_exceptions=True)
+    ror_matches = {}
+    for api_response in responses:
+        if isinstance(api_response, Exception):
+            logging.error(f"API request failed: {api_response!r}")
+            continue
+        if api_response['number_of_results'] == 0:
+            continue
+        ror_matches.update(await loop.run_in_executor(
+            executor, score_name_results, normalized_org_name, api_response.get('items', [])))
     return ror_matches
 
 
-def ror_url_search(url, rate_limiter):
-    params = {'query.advanced': f'links.value:"*{url}*"'}
-    try:
-        response = rate_limited_request(
-            'https://api.ror.org/v2/organizations', params=params, rate_limiter=rate_limiter)
-        response.raise_for_status()
-        api_response = response.json()
-    except requests.RequestException as e:
-        logging.error(f"API request failed: {e}")
-        return {}
+def url_search_params(url):
+    return {'query.advanced': f'links.value:"*{url}*"'}
+
 
+def parse_url_results(api_response):
     ror_matches = {}
     if 'items' in api_response:
         for item in api_response['items']:
             ror_id = item.get('id')
             ror_name = next((name['value'] for name in item.get('names', [])
                              if 'ror_display' in name.get('types', [])), None)
+            if ror_id:
+                record_cache.put(ror_id, item)
             if ror_id and ror_name:
                 match_info = MatchInfo()
                 match_info.set_url_match()
@@ -188,6 +576,28 @@ def ror_url_search(url, rate_limiter):
     return ror_matches
 
 
+def ror_url_search(url, rate_limiter):
+    try:
+        response = rate_limited_request(
+            ROR_API_URL, params=url_search_params(url), rate_limiter=rate_limiter)
+        response.raise_for_status()
+        api_response = response.json()
+    except requests.RequestException as e:
+        logging.error(f"API request failed: {e}")
+        return {}
+    return parse_url_results(api_response)
+
+
+async def async_ror_url_search(url, session, rate_limiter):
+    try:
+        api_response = await async_rate_limited_request(
+            session, ROR_API_URL, params=url_search_params(url), rate_limiter=rate_limiter)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.error(f"API request failed: {e!r}")
+        return {}
+    return parse_url_results(api_response)
+
+
 def parse_names(names):
     return [re.sub(r'\=\=[a-z]{2}', '', name) for name in names.split(';') if len(name) > 2]
 
@@ -196,68 +606,195 @@ def parse_urls(urls):
     return urls.split('==') if '==' in urls else [urls]
 
 
+def merge_name_matches(all_matches, ror_matches):
+    for ror_id, (ror_name, match_info) in ror_matches.items():
+        if ror_id in all_matches:
+            all_matches[ror_id][1].name_matches.update(
+                match_info.name_matches)
+            all_matches[ror_id][1].highest_ratio = max(
+                all_matches[ror_id][1].highest_ratio, match_info.highest_ratio)
+        else:
+            all_matches[ror_id] = (ror_name, match_info)
+    return all_matches
+
+
 def perform_name_matching(names, rate_limiter):
     all_matches = {}
     for name in names:
         logging.info(f"Searching for {name}...")
         ror_matches = ror_name_search(name, rate_limiter)
-        for ror_id, (ror_name, match_info) in ror_matches.items():
-            if ror_id in all_matches:
-                all_matches[ror_id][1].name_matches.update(
-                    match_info.name_matches)
-                all_matches[ror_id][1].highest_ratio = max(
-                    all_matches[ror_id][1].highest_ratio, match_info.highest_ratio)
-            else:
-                all_matches[ror_id] = (ror_name, match_info)
+        merge_name_matches(all_matches, ror_matches)
     return all_matches
 
 
+async def async_perform_name_matching(names, session, rate_limiter, executor):
+    for name in names:
+        logging.info(f"Searching for {name}...")
+    name_results = await asyncio.gather(
+        *[async_ror_name_search(name, session, rate_limiter, executor) for name in names])
+    all_matches = {}
+    for ror_matches in name_results:
+        merge_name_matches(all_matches, ror_matches)
+    return all_matches
+
+
+def extract_website_urls(org_data):
+    return [link['value'] for link in org_data.get('links', [])
+            if link.get('type') == 'website']
+
+
+def missing_record_batches(ror_ids):
+    missing = [ror_id for ror_id in dict.fromkeys(ror_ids) if ror_id not in record_cache]
+    return [missing[i:i+RECORD_BATCH_SIZE] for i in range(0, len(missing), RECORD_BATCH_SIZE)]
+
+
+def batch_query_params(batch):
+    return {'query.advanced': ' OR '.join(f'id:"{ror_id}"' for ror_id in batch)}
+
+
+def fetch_ror_records(ror_ids, rate_limiter):
+    for batch in missing_record_batches(ror_ids):
+        try:
+            response = rate_limited_request(
+                ROR_API_URL, params=batch_query_params(batch), rate_limiter=rate_limiter)
+            response.raise_for_status()
+            items = response.json().get('items', [])
+        except requests.RequestException as e:
+            logging.error(f"Batch fetch failed for {len(batch)} ROR IDs: {e}")
+            continue
+        for item in items:
+            if item.get('id'):
+                record_cache.put(item['id'], item)
+    return {ror_id: record_cache.get(ror_id) for ror_id in ror_ids}
+
+
+async def async_fetch_ror_records(ror_ids, session, rate_limiter):
+    batches = missing_record_batches(ror_ids)
+    responses = await asyncio.gather(
+        *[async_rate_limited_request(session, ROR_API_URL, params=batch_query_params(batch),
+                                     rate_limiter=rate_limiter) for batch in batches],
+        return_exceptions=True)
+    for batch, api_response in zip(batches, responses):
+        if isinstance(api_response, Exception):
+            logging.error(f"Batch fetch failed for {len(batch)} ROR IDs: {api_response!r}")
+            continue
+        for item in api_response.get('items', []):
+            if item.get('id'):
+                record_cache.put(item['id'], item)
+    return {ror_id: record_cache.get(ror_id) for ror_id in ror_ids}
+
+
 def get_ror_urls(ror_id, rate_limiter):
-    try:
-        response = rate_limited_request(
-            f'https://api.ror.org/v2/organizations/{ror_id}', rate_limiter=rate_limiter)
-        response.raise_for_status()
-        org_data = response.json()
-        website_urls = [link['value'] for link in org_data.get('links', [])
-                        if link.get('type') == 'website']
-        if not website_urls:
-            logging.warning(f"No website URL found for ROR ID: {ror_id}")
+    org_data = record_cache.get(ror_id)
+    if org_data is None:
+        try:
+            response = rate_limited_request(
+                f'{ROR_API_URL}/{ror_id}', rate_limiter=rate_limiter)
+            response.raise_for_status()
+            org_data = response.json()
+            record_cache.put(ror_id, org_data)
+        except requests.RequestException as e:
+            logging.error(f"Failed to fetch ROR URLs for {ror_id}: {e}")
+            return []
+    website_urls = extract_website_urls(org_data)
+    if not website_urls:
+        logging.warning(f"No website URL found for ROR ID: {ror_id}")
+    return website_urls
+
+
+async def async_get_ror_urls(ror_id, session, rate_limiter):
+    org_data = record_cache.get(ror_id)
+    if org_data is None:
+        try:
+            org_data = await async_rate_limited_request(
+                session, f'{ROR_API_URL}/{ror_id}', rate_limiter=rate_limiter)
+            record_cache.put(ror_id, org_data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"Failed to fetch ROR URLs for {ror_id}: {e!r}")
+            return []
+    website_urls = extract_website_urls(org_data)
+    if not website_urls:
+        logging.warning(f"No website URL found for ROR ID: {ror_id}")
+    return website_urls
 
-        return website_urls
-    except requests.RequestException as e:
-        logging.error(f"Failed to fetch ROR URLs for {ror_id}: {e}")
-        return []
+
+def url_matched_ids(urls, ror_urls_by_id):
+    candidate_index = DomainSuffixIndex()
+    for ror_id, ror_urls in ror_urls_by_id.items():
+        for ror_url in ror_urls:
+            candidate_index.add(ror_url, ror_id)
+    return candidate_index.lookup_all(urls)
+
+
+def cached_ror_urls(ror_ids):
+    return {ror_id: extract_website_urls(record_cache.get(ror_id) or {}) for ror_id in ror_ids}
+
+
+def index_url_matches(urls):
+    ror_matches = {}
+    for ror_id in sorted(domain_index.lookup_all(urls)):
+        match_info = MatchInfo()
+        match_info.set_url_match()
+        match_info.highest_ratio = 100
+        ror_matches[ror_id] = (domain_index.names.get(ror_id, ''), match_info)
+    return ror_matches
 
 
 def check_urls_against_matches(name_matches, urls, rate_limiter):
+    fetch_ror_records(list(name_matches), rate_limiter)
+    matched_ids = url_matched_ids(
+        urls, {ror_id: get_ror_urls(ror_id, rate_limiter) for ror_id in name_matches})
     verified_matches = {}
     for ror_id, (ror_name, match_info) in name_matches.items():
-        ror_urls = get_ror_urls(ror_id, rate_limiter)
-        if any(url in ror_url or ror_url in url for url in urls for ror_url in ror_urls):
+        if ror_id in matched_ids:
             match_info.set_url_match()
         verified_matches[ror_id] = (ror_name, match_info)
     return verified_matches
 
 
+async def async_check_urls_against_matches(name_matches, urls, session, rate_limiter):
+    await async_fetch_ror_records(list(name_matches), session, rate_limiter)
+    all_ror_urls = await asyncio.gather(
+        *[async_get_ror_urls(ror_id, session, rate_limiter) for ror_id in name_matches])
+    matched_ids = url_matched_ids(urls, dict(zip(name_matches, all_ror_urls)))
+    verified_matches = {}
+    for ror_id, (ror_name, match_info) in name_matches.items():
+        if ror_id in matched_ids:
+            match_info.set_url_match()
+        verified_matches[ror_id] = (ror_name, match_info)
+    return verified_matches
+
+
+def filter_url_matches(url, ror_matches):
+    matched_ids = url_matched_ids([url], cached_ror_urls(ror_matches))
+    return {ror_id: match for ror_id, match in ror_matches.items() if ror_id in matched_ids}
+
+
 def perform_url_matching(urls, rate_limiter):
+    if domain_index is not None:
+        return index_url_matches(urls)
     all_matches = {}
     for url in urls:
         logging.info(f"Searching for URL {url}...")
         ror_matches = ror_url_search(url, rate_limiter)
-        all_matches.update(ror_matches)
+        all_matches.update(filter_url_matches(url, ror_matches))
     return all_matches
 
 
-def process_row(row, file_header, ror_header, rate_limiter):
-    names = parse_names(row['e_displayname'])
-    urls = parse_urls(row['scopes'])
-    name_matches = perform_name_matching(names, rate_limiter)
-    if name_matches:
-        final_matches = check_urls_against_matches(
-            name_matches, urls, rate_limiter)
-    else:
-        final_matches = perform_url_matching(urls, rate_limiter)
+async def async_perform_url_matching(urls, session, rate_limiter):
+    if domain_index is not None:
+        return index_url_matches(urls)
+    for url in urls:
+        logging.info(f"Searching for URL {url}...")
+    url_results = await asyncio.gather(
+        *[async_ror_url_search(url, session, rate_limiter) for url in urls])
+    all_matches = {}
+    for url, ror_matches in zip(urls, url_results):
+        all_matches.update(filter_url_matches(url, ror_matches))
+    return all_matches
 
+
+def build_results(row, final_matches, ror_header):
     results = []
     if final_matches:
         for ror_id, (ror_name, match_info) in final_matches.items():
@@ -270,37 +807,98 @@ def process_row(row, file_header, ror_header, rate_limiter):
     return results
 
 
-def search_json(input_file, output_file):
-    file_header = ['id', 'entityid', 'roles', 'regauth', 'e_displayname', 'entity_cat',
-                   'roledesc', 'r_displayname', 'r_description', 'role_service_name', 'eccs_status', 'clash',
-                   'validator_status', 'coco_status', 'coco_id', 'sirtfi_status', 'code', 'scopes', 'first_seen']
-    ror_header = ["matched_ror_id", "matched_name",
-                  "match_type", "match_ratio"]
+def process_row(row, file_header, ror_header, rate_limiter):
+    row_start = time.time()
+    names = parse_names(row['e_displayname'])
+    urls = parse_urls(row['scopes'])
+    name_matches = perform_name_matching(names, rate_limiter)
+    if name_matches:
+        final_matches = check_urls_against_matches(
+            name_matches, urls, rate_limiter)
+    else:
+        final_matches = perform_url_matching(urls, rate_limiter)
+    telemetry.record_row(time.time() - row_start)
+    return build_results(row, final_matches, ror_header)
+
+
+def process_row_with_telemetry(row, file_header, ror_header, rate_limiter):
+    results = process_row(row, file_header, ror_header, rate_limiter)
+    return results, telemetry.drain()
+
+
+async def async_process_row(row, ror_header, session, rate_limiter, executor):
+    row_start = time.time()
+    names = parse_names(row['e_displayname'])
+    urls = parse_urls(row['scopes'])
+    name_matches = await async_perform_name_matching(names, session, rate_limiter, executor)
+    if name_matches:
+        final_matches = await async_check_urls_against_matches(
+            name_matches, urls, session, rate_limiter)
+    else:
+        final_matches = await async_perform_url_matching(urls, session, rate_limiter)
+    telemetry.record_row(time.time() - row_start)
+    return build_results(row, final_matches, ror_header)
+
+
+def search_json(input_file, output_file, index=None):
+    file_header = FILE_HEADER
+    ror_header = ROR_HEADER
 
     with open(input_file, 'r') as f_in, open(output_file, 'w', newline='') as f_out:
         reader = csv.DictReader(f_in)
         writer = csv.DictWriter(f_out, fieldnames=file_header + ror_header)
         writer.writeheader()
         shared_rate_limiter = init_shared_rate_limiter()
-        pool = multiprocessing.Pool(MAX_PARALLEL_REQUESTS)
-        chunk_size = 100
+        pool = multiprocessing.Pool(MAX_PARALLEL_REQUESTS, initializer=set_domain_index,
+                                    initargs=(index,))
         rows = list(reader)
         total_rows = len(rows)
-        for i in range(0, total_rows, chunk_size):
-            chunk = rows[i:i+chunk_size]
-            logging.info(f"Processing chunk {i//chunk_size + 1} of {(total_rows-1)//chunk_size + 1}")
-
-            process_row_partial = partial(
-                process_row, file_header=file_header, ror_header=ror_header, rate_limiter=shared_rate_limiter)
-            results = pool.map(process_row_partial, chunk)
-
-            for result_list in results:
-                for result in result_list:
-                    writer.writerow(result)
+        process_row_partial = partial(
+            process_row_with_telemetry, file_header=file_header, ror_header=ror_header,
+            rate_limiter=shared_rate_limiter)
+        for rows_done, (result_list, row_telemetry) in enumerate(pool.imap(process_row_partial, rows), 1):
+            telemetry.merge(row_telemetry)
+            for result in result_list:
+                writer.writerow(result)
+            telemetry.log_progress(rows_done, total_rows)
         pool.close()
         pool.join()
 
 
+def count_rows(input_file):
+    with open(input_file, 'r') as f_in:
+        return sum(1 for _ in csv.DictReader(f_in))
+
+
+async def search_json_async(input_file, output_file, concurrency, score_workers):
+    total_rows = count_rows(input_file)
+    rate_limiter = AsyncRateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, MAX_PARALLEL_REQUESTS)
+    timeout = aiohttp.ClientTimeout(total=ASYNC_REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    executor = ThreadPoolExecutor(max_workers=score_workers)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            with open(input_file, 'r') as f_in, open(output_file, 'w', newline='') as f_out:
+                reader = csv.DictReader(f_in)
+                writer = csv.DictWriter(f_out, fieldnames=FILE_HEADER + ROR_HEADER)
+                writer.writeheader()
+                pending = deque()
+                rows_done = 0
+                for row in reader:
+                    pending.append(asyncio.create_task(
+                        async_process_row(row, ROR_HEADER, session, rate_limiter, executor)))
+                    if len(pending) >= concurrency:
+                        writer.writerows(await pending.popleft())
+                        rows_done += 1
+                        telemetry.log_progress(rows_done, total_rows)
+                while pending:
+                    writer.writerows(await pending.popleft())
+                    rows_done += 1
+                    telemetry.log_progress(rows_done, total_rows)
+    finally:
+        executor.shutdown()
+
+
 def main():
     args = parse_arguments()
     setup_logging(args.verbose)
@@ -308,7 +906,16 @@ def main():
     output_file = args.output or f'{os.path.splitext(input_file)[0]}_reconciled.csv'
     logging.info(f"Processing input file: {input_file}")
     logging.info(f"Output will be written to: {output_file}")
-    search_json(input_file, output_file)
+    metrics_file = args.metrics or f'{os.path.splitext(output_file)[0]}_metrics.json'
+    telemetry.progress_interval = args.progress_interval
+    index = build_domain_index(args.data_dump) if args.data_dump else None
+    if args.engine == 'async':
+        set_domain_index(index)
+        asyncio.run(search_json_async(
+            input_file, output_file, args.concurrency, args.score_workers))
+    else:
+        search_json(input_file, output_file, index)
+    telemetry.write_report(metrics_file)
     logging.info("Processing complete.")
 
 
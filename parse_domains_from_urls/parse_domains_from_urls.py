@@ -1,9 +1,16 @@
 import re
+import os
 import csv
 import json
 import argparse
+import itertools
+import multiprocessing
+from collections import deque
+from functools import lru_cache
 from furl import furl
 
+MAX_SAMPLE_IDS = 100
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -14,6 +21,12 @@ def parse_arguments():
                         help="Path to the input JSON file")
     parser.add_argument("-o", "--output_file",
                         default="parsed_domains.csv", help="Path to the output CSV file")
+    parser.add_argument("-c", "--chunk_size", type=int, default=0,
+                        help="Stream the input in chunks of this many rows (0 reads it all at once)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes used in chunked mode")
+    parser.add_argument("-s", "--summary_file", default="parse_summary.json",
+                        help="Path to the JSON summary of rows without a domain in chunked mode")
     return parser.parse_args()
 
 
@@ -43,12 +56,19 @@ def extract_website(record):
     return None
 
 
+@lru_cache(maxsize=100000)
+def domain_from_url(url):
+    domain = furl(url).host
+    if domain:
+        domain = re.sub(r'^w{3}\d?\.', '', domain)
+        domain = re.sub(r'^(english\.|en\.|eng\.|e\.|about\.|international\.|web\.|eweb\.|old\.|about\.)', '', domain)
+    return domain
+
+
 def reduce_to_domain(url):
     try:
-        domain = furl(url).host
+        domain = domain_from_url(url)
         if domain:
-            domain = re.sub(r'^w{3}\d?\.', '', domain)
-            domain = re.sub(r'^(english\.|en\.|eng\.|e\.|about\.|international\.|web\.|eweb\.|old\.|about\.)', '', domain)
             return domain
         else:
             print(f"No domain found in URL: {url}")
@@ -80,6 +100,95 @@ def process_data(csv_data, json_data):
     return csv_data
 
 
+def init_worker(websites):
+    global worker_websites
+    worker_websites = websites
+
+
+def new_summary():
+    return {reason: {'count': 0, 'sample_ids': []}
+            for reason in ['no_matching_record', 'no_website', 'no_domain', 'invalid_url']}
+
+
+def record_miss(summary, reason, ror_id):
+    summary[reason]['count'] += 1
+    if len(summary[reason]['sample_ids']) < MAX_SAMPLE_IDS:
+        summary[reason]['sample_ids'].append(ror_id)
+
+
+def process_chunk(rows):
+    summary = new_summary()
+    for row in rows:
+        ror_id = row["ror_id"]
+        row["website"] = ""
+        row["extracted_domain"] = ""
+        if ror_id not in worker_websites:
+            record_miss(summary, 'no_matching_record', ror_id)
+            continue
+        website = worker_websites[ror_id]
+        if not website:
+            record_miss(summary, 'no_website', ror_id)
+            continue
+        row["website"] = website
+        try:
+            domain = domain_from_url(website)
+        except ValueError:
+            record_miss(summary, 'invalid_url', ror_id)
+            domain = None
+        else:
+            if not domain:
+                record_miss(summary, 'no_domain', ror_id)
+        row["extracted_domain"] = domain
+    return rows, summary
+
+
+def merge_summary(summary, chunk_summary):
+    for reason, misses in chunk_summary.items():
+        summary[reason]['count'] += misses['count']
+        room = MAX_SAMPLE_IDS - len(summary[reason]['sample_ids'])
+        summary[reason]['sample_ids'].extend(misses['sample_ids'][:room])
+
+
+def read_csv_chunks(reader, chunk_size):
+    while True:
+        chunk = list(itertools.islice(reader, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_chunked(input_file, json_data, output_file, summary_file, chunk_size, workers):
+    websites = {record["id"]: extract_website(record) for record in json_data}
+    summary = new_summary()
+    total_rows = 0
+    with open(input_file, 'r', encoding='utf-8') as f_in, \
+            open(output_file, 'w', encoding='utf-8', newline='') as f_out, \
+            multiprocessing.Pool(workers, initializer=init_worker, initargs=(websites,)) as pool:
+        reader = csv.DictReader(f_in)
+        fieldnames = list(reader.fieldnames) + [field for field in ["website", "extracted_domain"]
+                                                if field not in reader.fieldnames]
+        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
+        writer.writeheader()
+        pending = deque()
+
+        def write_next():
+            rows, chunk_summary = pending.popleft().get()
+            writer.writerows(rows)
+            merge_summary(summary, chunk_summary)
+            return len(rows)
+
+        for chunk in read_csv_chunks(reader, chunk_size):
+            pending.append(pool.apply_async(process_chunk, (chunk,)))
+            if len(pending) >= workers * 2:
+                total_rows += write_next()
+        while pending:
+            total_rows += write_next()
+    summary = {'total_rows': total_rows, 'misses': summary}
+    with open(summary_file, 'w', encoding='utf-8') as f_summary:
+        json.dump(summary, f_summary, indent=2)
+    return summary
+
+
 def write_csv(data, file_path):
     try:
         with open(file_path, 'w', encoding='utf-8', newline='') as f_out:
@@ -94,6 +203,17 @@ def write_csv(data, file_path):
 
 def main():
     args = parse_arguments()
+    if args.chunk_size > 0:
+        json_data = read_json(args.data_dump)
+        if not json_data:
+            print("Error: Unable to process input files")
+            return
+        summary = process_chunked(args.input_file, json_data, args.output_file, args.summary_file,
+                                  args.chunk_size, args.workers)
+        missed = sum(misses['count'] for misses in summary['misses'].values())
+        print(f"Processing complete. {summary['total_rows']} rows written to {args.output_file}, "
+              f"{missed} without a domain (see {args.summary_file})")
+        return
     csv_data = read_csv(args.input_file)
     json_data = read_json(args.data_dump)
     if not csv_data or not json_data:
@@ -0,0 +1,271 @@
+import os
+import csv
+import sys
+import time
+import queue
+import logging
+import argparse
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for tool_dir in ['edugain/get-edugain-data', 'edugain/match_edugain_ror',
+                 'parse_domains_from_urls', 'check_domain_on_site']:
+    sys.path.insert(0, os.path.join(BASE_DIR, tool_dir))
+
+import get_edugain_data as edugain
+import match_edugain_ror as matcher
+import parse_domains_from_urls as domain_parser
+import check_domain_on_site as site_checker
+
+DONE = object()
+SCOPE_SEPARATOR = '=='
+PARSE_FIELDS = ['ror_id', 'website', 'extracted_domain', 'domains']
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Run eduGAIN fetch, ROR matching, domain parsing and site checking as one streaming pipeline.")
+    parser.add_argument('-d', '--data_dump', required=True,
+                        help="Path to the ROR data dump JSON file")
+    parser.add_argument('-i', '--input',
+                        help="Existing eduGAIN CSV to use instead of fetching from the eduGAIN API")
+    parser.add_argument('-o', '--output', default="pipeline_results.csv",
+                        help="Output CSV file path")
+    parser.add_argument('--match-workers', type=int, default=matcher.MAX_PARALLEL_REQUESTS,
+                        help="Threads matching eduGAIN rows against ROR")
+    parser.add_argument('--parse-workers', type=int, default=1,
+                        help="Threads attaching ROR websites and domains")
+    parser.add_argument('--check-workers', type=int, default=2,
+                        help="Threads checking sites, each with its own browser")
+    parser.add_argument('--queue-size', type=int, default=100,
+                        help="Maximum rows buffered between stages")
+    parser.add_argument('-t', '--timeout', type=int, default=10,
+                        help="Site resolution timeout")
+    parser.add_argument('-r', '--redirects', type=int, default=5,
+                        help="Max redirects")
+    parser.add_argument('-p', '--render-profile', choices=['full', 'light'], default='light',
+                        help="Browser render profile for site checking")
+    parser.add_argument('-b', '--max-page-bytes', type=int, default=2_000_000,
+                        help="Max HTML bytes kept per page in the light profile")
+    parser.add_argument('-m', '--discover-sitemaps', action='store_true',
+                        help="Find contact pages via robots.txt and sitemaps before rendering the homepage")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Enable verbose logging")
+    return parser.parse_args()
+
+
+class Stage:
+    def __init__(self, name, func, workers, in_queue, out_queue, setup=None, teardown=None,
+                 fallback=None):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.setup = setup
+        self.teardown = teardown
+        self.fallback = fallback
+        self.active = workers
+        self.failed_setups = 0
+        self.processed = 0
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self.run, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def run(self):
+        state = None
+        try:
+            try:
+                state = self.setup() if self.setup else None
+            except Exception as e:
+                logging.error(f"Failed to set up {self.name} worker: {e}")
+                with self.lock:
+                    self.failed_setups += 1
+                    all_failed = self.failed_setups == self.workers
+                if all_failed:
+                    logging.error(f"All {self.name} workers failed to start, passing rows through")
+                    self.pass_through()
+                return
+            while True:
+                item = self.in_queue.get()
+                if item is DONE:
+                    self.in_queue.put(DONE)
+                    break
+                try:
+                    for output in self.func(state, item):
+                        self.out_queue.put(output)
+                except Exception as e:
+                    logging.error(f"Error in {self.name} stage: {e}")
+                    if self.fallback:
+                        for output in self.fallback(item):
+                            self.out_queue.put(output)
+                with self.lock:
+                    self.processed += 1
+        finally:
+            if self.teardown and state is not None:
+                self.teardown(state)
+            with self.lock:
+                self.active -= 1
+                last_worker = self.active == 0
+            if last_worker:
+                self.out_queue.put(DONE)
+
+    def pass_through(self):
+        while True:
+            item = self.in_queue.get()
+            if item is DONE:
+                self.in_queue.put(DONE)
+                return
+            if self.fallback:
+                for output in self.fallback(item):
+                    self.out_queue.put(output)
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+
+def stringify_row(row):
+    return {key: '' if value is None else str(value) for key, value in row.items()}
+
+
+def read_edugain_rows(input_file):
+    if input_file:
+        with open(input_file, 'r', encoding='utf-8') as f_in:
+            yield from csv.DictReader(f_in)
+    else:
+        json_data = edugain.fetch_json_data()
+        for row in edugain.parse_json_data(json_data):
+            yield stringify_row(row)
+
+
+def fetch_stage(input_file, out_queue):
+    try:
+        for row in read_edugain_rows(input_file):
+            out_queue.put(row)
+    except Exception as e:
+        logging.error(f"Error fetching eduGAIN data: {e}")
+    finally:
+        out_queue.put(DONE)
+
+
+def match_row(rate_limiter):
+    def run(state, row):
+        try:
+            return matcher.process_row(row, matcher.FILE_HEADER, matcher.ROR_HEADER, rate_limiter)
+        except Exception as e:
+            logging.error(f"Error matching row {row.get('id', 'unknown')}: {e}")
+            return [row]
+    return run
+
+
+def unprocessed_row(row):
+    return [row]
+
+
+def unchecked_row(row):
+    return [site_checker.create_error_result(row)]
+
+
+def parse_row(websites):
+    def run(state, row):
+        ror_id = row.get('matched_ror_id')
+        website = websites.get(ror_id) if ror_id else None
+        row['ror_id'] = ror_id or ''
+        row['website'] = website or ''
+        row['extracted_domain'] = (domain_parser.reduce_to_domain(website) or '') if website else ''
+        row['domains'] = row.get('scopes', '')
+        return [row]
+    return run
+
+
+def check_row(check_args):
+    def run(driver, row):
+        if not row.get('website'):
+            return [site_checker.create_error_result(row)]
+        try:
+            result = site_checker.process_row(driver, row, check_args)
+        except Exception as e:
+            logging.error(f"Error checking row {row.get('ror_id', 'unknown')}: {e}")
+            result = None
+        time.sleep(1)
+        return [result if result is not None else site_checker.create_error_result(row)]
+    return run
+
+
+def write_results(output_file, fieldnames, in_queue):
+    written = 0
+    with open(output_file, 'w', encoding='utf-8', newline='') as f_out:
+        writer = csv.DictWriter(f_out, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        while True:
+            row = in_queue.get()
+            if row is DONE:
+                break
+            writer.writerow(row)
+            f_out.flush()
+            written += 1
+            if written % 100 == 0:
+                logging.info(f"Wrote {written} rows")
+    return written
+
+
+def run_pipeline(args):
+    records = domain_parser.read_json(args.data_dump)
+    websites = {record['id']: domain_parser.extract_website(record) for record in records}
+    index = matcher.index_ror_records(records)
+    matcher.set_domain_index(index)
+    del records
+
+    rate_limiter = matcher.GlobalRateLimiter(
+        matcher.RATE_LIMIT_CALLS, matcher.RATE_LIMIT_PERIOD, [], threading.Lock())
+    check_args = argparse.Namespace(id='ror_id', website='website', field='domains',
+                                    sep=SCOPE_SEPARATOR, timeout=args.timeout,
+                                    redirects=args.redirects, verify=True,
+                                    render_profile=args.render_profile,
+                                    max_page_bytes=args.max_page_bytes,
+                                    discover_sitemaps=args.discover_sitemaps,
+                                    fixed_timeouts=False, hedge=True)
+
+    edugain_queue = queue.Queue(args.queue_size)
+    matched_queue = queue.Queue(args.queue_size)
+    parsed_queue = queue.Queue(args.queue_size)
+    results_queue = queue.Queue(args.queue_size)
+
+    stages = [
+        Stage('match', match_row(rate_limiter), args.match_workers, edugain_queue, matched_queue,
+              fallback=unprocessed_row),
+        Stage('parse', parse_row(websites), args.parse_workers, matched_queue, parsed_queue,
+              fallback=unprocessed_row),
+        Stage('check', check_row(check_args), args.check_workers, parsed_queue, results_queue,
+              setup=lambda: site_checker.setup_webdriver(args.render_profile),
+              teardown=site_checker.cleanup, fallback=unchecked_row),
+    ]
+    for stage in stages:
+        stage.start()
+    fetcher = threading.Thread(target=fetch_stage, args=(args.input, edugain_queue), daemon=True)
+    fetcher.start()
+
+    fieldnames = matcher.FILE_HEADER + matcher.ROR_HEADER + PARSE_FIELDS + site_checker.RESULT_FIELDS
+    written = write_results(args.output, fieldnames, results_queue)
+    fetcher.join()
+    for stage in stages:
+        stage.join()
+        logging.info(f"{stage.name} stage processed {stage.processed} rows")
+    logging.info(f"Wrote {written} rows to {args.output}")
+
+
+def main():
+    args = parse_arguments()
+    logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    run_pipeline(args)
+    logging.info("Pipeline complete.")
+
+
+if __name__ == '__main__':
+    main()